@@ -1,22 +1,97 @@
-from openai import OpenAI
+from openai import AsyncOpenAI
+import asyncio
+import atexit
+import hashlib
+import httpx
 import json
+import openai
+import orjson
 import re
+import tiktoken
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 from typing import Dict, Any
 import argparse
 import os
 
 # Constants (define these as needed)
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Single shared async client so httpx connection pooling is reused across calls;
+# HTTP/2 + keepalive lets all concurrent calls share warm connections instead
+# of paying a TLS handshake each
+http_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+    timeout=60.0,
+)
+# max_retries=0: chat calls are retried by the tenacity wrapper below, and
+# stacking the SDK's internal retries under it would multiply attempts on a
+# persistent failure. Batch-mode file/poll calls are cheap to rerun if they
+# hit a transient error.
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=http_client, max_retries=0)
+
+_sem = asyncio.Semaphore(int(os.getenv("OPENAI_CONCURRENCY", "8")))
+
+# Model used for the short label translations; overridable so a faster/cheaper
+# tier can be swapped in without touching the generation calls. Combined with
+# the disk cache, each (text, language) pair is resolved at most once anyway.
+TRANSLATION_MODEL = os.getenv("TRANSLATION_MODEL", "gpt-4o-mini")
 FOOTER_JSON_PATH = os.getenv("FOOTER_JSON_PATH")
 
+# The footer strings are static, so translations can be cached on disk
+# keyed by (text, language) and reused across runs
+TRANSLATION_CACHE_PATH = os.path.expanduser("~/.cache/footer_translations.json")
+
+def _load_translation_cache() -> Dict[str, str]:
+    try:
+        with open(TRANSLATION_CACHE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def _save_translation_cache():
+    try:
+        os.makedirs(os.path.dirname(TRANSLATION_CACHE_PATH), exist_ok=True)
+        with open(TRANSLATION_CACHE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(_translation_cache, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"Could not save translation cache: {e}")
+
+_translation_cache = _load_translation_cache()
+atexit.register(_save_translation_cache)
+
+# Retry only transient API failures, with exponential backoff + jitter;
+# auth errors and other permanent failures propagate immediately
+@retry(
+    retry=retry_if_exception_type((openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError)),
+    wait=wait_random_exponential(min=1, max=30),
+    stop=stop_after_attempt(5),
+    reraise=True,
+)
+async def _chat_completion(**kwargs):
+    # Cap in-flight requests so a gather burst stays under RPM/TPM limits
+    # instead of tripping 429s that cost more time than concurrency saves
+    async with _sem:
+        return await client.chat.completions.create(**kwargs)
+
+def loads_json(data: str):
+    """Decode a model response with orjson, falling back to stdlib json
+    which is more forgiving about stray escapes"""
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return json.loads(data)
+
+_JSON_FENCE_OPEN = re.compile(r'```json\s*')
+_JSON_FENCE_CLOSE = re.compile(r'```\s*$')
+# Map curly quotes to their ASCII equivalents in one pass
+_QUOTE_TABLE = str.maketrans({'“': '"', '”': '"', '‘': "'", '’': "'"})
+
 def clean_json_response(response_text: str) -> str:
-    response_text = re.sub(r'```json\s*', '', response_text)
-    response_text = re.sub(r'```\s*$', '', response_text)
-    response_text = response_text.replace('"', '"').replace('"', '"')
-    response_text = response_text.replace(''', "'").replace(''', "'")
+    response_text = _JSON_FENCE_OPEN.sub('', response_text)
+    response_text = _JSON_FENCE_CLOSE.sub('', response_text)
+    response_text = response_text.translate(_QUOTE_TABLE)
     return response_text.strip()
 
-def fix_json_with_gpt(broken_json: str, context: str) -> str:
+async def fix_json_with_gpt(broken_json: str, context: str) -> str:
     fix_prompt = f"""Fix this broken JSON and return ONLY valid JSON (no explanations, no markdown):
 
 Context: {context}
@@ -30,44 +105,78 @@ Rules:
 - Return only the fixed JSON"""
 
     try:
-        response = client.chat.completions.create(
+        response = await _chat_completion(
             model="gpt-4o-mini",
             messages=[{"role": "user", "content": fix_prompt}],
             temperature=0.1,
             max_tokens=500
         )
         return clean_json_response(response.choices[0].message.content.strip())
-    except:
-        return broken_json
-
-def prompt_gpt(prompt: str, max_retries: int = 3) -> str:
-    for attempt in range(max_retries):
-        try:
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                max_tokens=300
-            )
-            result = response.choices[0].message.content.strip()
-            return result
-        except Exception as e:
-            if attempt == max_retries - 1:
-                raise e
-            continue
-
-def translate_text(text, target_language):
+    except openai.OpenAIError as e:
+        # Returning the broken JSON here would just move the failure to a
+        # confusing json.loads traceback far from the real cause
+        print(f"fix_json_with_gpt failed for {context}: {e}")
+        raise
+
+# gpt-4o-mini context window; warn well before prompts approach it
+_MODEL_CONTEXT_TOKENS = 128000
+_encoding = tiktoken.encoding_for_model("gpt-4o-mini")
+
+async def prompt_gpt(prompt: str, max_tokens: int = 300, response_format: dict = None, stream: bool = False, system: str = None) -> str:
+    messages = _build_messages(prompt, system)
+    prompt_tokens = sum(len(_encoding.encode(m["content"])) for m in messages)
+    if prompt_tokens + max_tokens > _MODEL_CONTEXT_TOKENS * 0.9:
+        print(f"Warning: prompt of {prompt_tokens} tokens is approaching the model context limit")
+    kwargs = {}
+    if response_format is not None:
+        kwargs["response_format"] = response_format
+    response = await _chat_completion(
+        model="gpt-4o-mini",
+        messages=messages,
+        temperature=0.7,
+        max_tokens=max_tokens,
+        stream=stream,
+        **kwargs
+    )
+    if stream:
+        # Accumulate deltas as they arrive; the connection slot frees as soon
+        # as the final token lands instead of waiting on full-body buffering
+        buf = ""
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                buf += chunk.choices[0].delta.content
+        return buf.strip()
+    return response.choices[0].message.content.strip()
+
+def _build_messages(prompt: str, system: str = None) -> list:
+    """Static instructions go in the system message so OpenAI's automatic
+    prompt caching hits on the identical prefix across runs"""
+    messages = []
+    if system is not None:
+        messages.append({"role": "system", "content": system})
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+async def translate_text(text, target_language):
+    cache_key = f"{target_language}:{text}"
+    if cache_key in _translation_cache:
+        return _translation_cache[cache_key]
     prompt = f"Translate to {target_language}. Return only the translation, no explanations: {text}"
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
+        response = await _chat_completion(
+            model=TRANSLATION_MODEL,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
+            max_tokens=100,
         )
-        return response.choices[0].message.content.strip().replace('"','')
+        translated = response.choices[0].message.content.strip().replace('"','')
+        _translation_cache[cache_key] = translated
+        return translated
     except Exception as e:
+        # Return None rather than the source text so callers can tell a
+        # failure apart from a legitimate identical translation
         print(f"Translation error: {e}")
-        return text
+        return None
 
 def replace_in_file(file_path: str, placeholder: str, content: str):
     with open(file_path, 'r', encoding='utf-8') as f:
@@ -76,6 +185,24 @@ def replace_in_file(file_path: str, placeholder: str, content: str):
     with open(file_path, 'w', encoding='utf-8') as f:
         f.write(data)
 
+def apply_replacements(file_path: str, replacements: Dict[str, str]):
+    """Apply all placeholder substitutions in one read, one scan, one write.
+
+    Placeholder and replacement lengths differ, so in-place mmap patching
+    is not an option; a single alternation pass over one in-memory copy is
+    the cheapest correct strategy even for megabyte-scale theme JSON.
+    """
+    if not replacements:
+        return
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = f.read()
+    # Longest keys first: regex alternation is leftmost, not longest-match,
+    # so a key that prefixes another would otherwise shadow it
+    pattern = re.compile("|".join(re.escape(k) for k in sorted(replacements, key=len, reverse=True)))
+    data = pattern.sub(lambda m: replacements[m.group(0)], data)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(data)
+
 def validate_html_format(text: str, expected_format: str = None) -> bool:
     """Validate if generated text maintains HTML format"""
     if expected_format and "<" in expected_format:
@@ -84,13 +211,13 @@ def validate_html_format(text: str, expected_format: str = None) -> bool:
         return len(original_tags) <= len(result_tags)
     return True
 
-def generate_with_format_validation(prompt: str, expected_format: str = None) -> str:
+async def generate_with_format_validation(prompt: str, expected_format: str = None) -> str:
     """Generate content and validate HTML format"""
     if expected_format and "<" in expected_format:
         prompt += f"\n\nIMPORTANT: Maintain the exact HTML structure from this example: {expected_format}"
 
     for attempt in range(3):
-        result = prompt_gpt(prompt)
+        result = await prompt_gpt(prompt)
         if validate_html_format(result, expected_format):
             return result
         prompt += "\n\nPlease maintain the HTML tags structure exactly as shown in the example."
@@ -99,215 +226,433 @@ def generate_with_format_validation(prompt: str, expected_format: str = None) ->
 
 # ===== FOOTER TRANSLATION FUNCTION =====
 
-def process_footer_translations(brand_name: str, product_title: str, language: str):
-    """Process footer translation placeholders"""
-    translated = translate_text("* We Promise not to use your email for Spam! You can unsubscribe at any time.", language)
-    replace_in_file(FOOTER_JSON_PATH, "NEW_NEWSLETTER_SMALL_TEXT_TRANSLATED", translated)
-
-    translated = translate_text("Information", language)
-    replace_in_file(FOOTER_JSON_PATH, "NEW_FOOTER_INFO_HEADING_TRANSLATED", translated)
-
-    translated = translate_text("Shop", language)
-    replace_in_file(FOOTER_JSON_PATH, "NEW_FOOTER_SHOP_HEADING_TRANSLATED", translated)
+_FOOTER_TRANSLATIONS = [
+    ("* We Promise not to use your email for Spam! You can unsubscribe at any time.", "NEW_NEWSLETTER_SMALL_TEXT_TRANSLATED"),
+    ("Information", "NEW_FOOTER_INFO_HEADING_TRANSLATED"),
+    ("Shop", "NEW_FOOTER_SHOP_HEADING_TRANSLATED"),
+    ("Subscribe to our emails", "NEW_FOOTER_NEWSLETTER_HEADING_TRANSLATED"),
+]
+
+async def translate_batch(strings, target_language):
+    """Translate several strings in one API call, returning them in order"""
+    prompt = (
+        f"Translate each of the following strings to {target_language}. "
+        f'Return ONLY a JSON object of the form {{"translations": [...]}} with the '
+        f"translations in the same order, no explanations: {json.dumps(strings, ensure_ascii=False)}"
+    )
+    try:
+        response = await _chat_completion(
+            model=TRANSLATION_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.3,
+            response_format={"type": "json_object"},
+        )
+        translations = loads_json(response.choices[0].message.content)["translations"]
+        if len(translations) != len(strings):
+            raise ValueError(f"Expected {len(strings)} translations, got {len(translations)}")
+        return translations
+    except Exception as e:
+        print(f"Batch translation error, falling back to per-string calls: {e}")
+        return await asyncio.gather(*[translate_text(text, target_language) for text in strings])
 
-    translated = translate_text("Subscribe to our emails", language)
-    replace_in_file(FOOTER_JSON_PATH, "NEW_FOOTER_NEWSLETTER_HEADING_TRANSLATED", translated)
+async def process_footer_translations(brand_name: str, product_title: str, language: str):
+    """Process footer translation placeholders"""
+    replacements = {}
+    pending = []
+    for text, placeholder in _FOOTER_TRANSLATIONS:
+        cached = _translation_cache.get(f"{language}:{text}")
+        if cached is not None:
+            replacements[placeholder] = cached
+        else:
+            pending.append((text, placeholder))
+    if pending:
+        # One fused call covers every uncached string: one RTT, one prefill
+        translations = await translate_batch([text for text, _ in pending], language)
+        for (text, placeholder), translated in zip(pending, translations):
+            if translated is None:
+                # Fallback failed for this string; use the English source for
+                # this run but leave the cache clean so the next run retries
+                replacements[placeholder] = text
+                continue
+            _translation_cache[f"{language}:{text}"] = translated
+            replacements[placeholder] = translated
+    return replacements
 
 # ===== FOOTER CONTENT GENERATION FUNCTIONS =====
 
-def generate_trust_badges_prompt(brand_name: str, product_title: str, product_description: str, language: str) -> str:
-    return f"""Create 4 trust badge contents in {language} for {brand_name}™'s {product_title}.
-
-PRODUCT: {product_description}
+# JSON schema for the combined footer content call; with strict structured
+# outputs the model guarantees parseable JSON matching this shape server-side
+_BADGE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "text": {"type": "string"}
+    },
+    "required": ["title", "text"],
+    "additionalProperties": False
+}
+
+FOOTER_CONTENT_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "footer_content",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "trust_badges": {
+                    "type": "object",
+                    "properties": {
+                        "badge_1": _BADGE_SCHEMA,
+                        "badge_2": _BADGE_SCHEMA,
+                        "badge_3": _BADGE_SCHEMA,
+                        "badge_4": _BADGE_SCHEMA
+                    },
+                    "required": ["badge_1", "badge_2", "badge_3", "badge_4"],
+                    "additionalProperties": False
+                },
+                "scroll_texts": {
+                    "type": "object",
+                    "properties": {
+                        "text_1": {"type": "string"},
+                        "outline_1": {"type": "string"},
+                        "text_2": {"type": "string"},
+                        "outline_2": {"type": "string"},
+                        "text_3": {"type": "string"},
+                        "outline_3": {"type": "string"}
+                    },
+                    "required": ["text_1", "outline_1", "text_2", "outline_2", "text_3", "outline_3"],
+                    "additionalProperties": False
+                },
+                "newsletter": {
+                    "type": "object",
+                    "properties": {
+                        "heading": {"type": "string"},
+                        "text": {"type": "string"}
+                    },
+                    "required": ["heading", "text"],
+                    "additionalProperties": False
+                },
+                "footer_contact": {
+                    "type": "object",
+                    "properties": {
+                        "heading": {"type": "string"},
+                        "subtext": {"type": "string"}
+                    },
+                    "required": ["heading", "subtext"],
+                    "additionalProperties": False
+                }
+            },
+            "required": ["trust_badges", "scroll_texts", "newsletter", "footer_contact"],
+            "additionalProperties": False
+        }
+    }
+}
+
+# Static instructions and schema for the fused footer call. Kept free of any
+# per-run data so the server-side prompt cache hits on repeated invocations.
+FOOTER_CONTENT_SYSTEM_PROMPT = """You create Shopify footer content for a brand's product.
 
 Return ONLY valid JSON:
 
-{{
-  "badge_1": {{
-    "title": "<strong>Badge title</strong>",
-    "text": "<p>Badge description</p>"
-  }},
-  "badge_2": {{
-    "title": "<strong>Badge title</strong>",
-    "text": "<p>Badge description</p>"
-  }},
-  "badge_3": {{
-    "title": "<strong>Badge title</strong>",
-    "text": "<p>Badge description</p>"
-  }},
-  "badge_4": {{
-    "title": "<strong>Badge title</strong>",
-    "text": "<p>Badge description</p>"
-  }}
-}}
-
-Requirements:
+{
+  "trust_badges": {
+    "badge_1": {
+      "title": "<strong>Badge title</strong>",
+      "text": "<p>Badge description</p>"
+    },
+    "badge_2": {
+      "title": "<strong>Badge title</strong>",
+      "text": "<p>Badge description</p>"
+    },
+    "badge_3": {
+      "title": "<strong>Badge title</strong>",
+      "text": "<p>Badge description</p>"
+    },
+    "badge_4": {
+      "title": "<strong>Badge title</strong>",
+      "text": "<p>Badge description</p>"
+    }
+  },
+  "scroll_texts": {
+    "text_1": "<strong>Scrolling text</strong>",
+    "outline_1": "Outline word",
+    "text_2": "<strong>Scrolling text</strong>",
+    "outline_2": "Outline word",
+    "text_3": "<strong>Scrolling text</strong>",
+    "outline_3": "Outline word"
+  },
+  "newsletter": {
+    "heading": "Newsletter heading",
+    "text": "<p>Newsletter description</p>"
+  },
+  "footer_contact": {
+    "heading": "Contact heading",
+    "subtext": "<p>Contact details</p>"
+  }
+}
+
+Requirements for trust_badges:
 - 'title' must use HTML <strong> tags, e.g., <strong>Fast Shipping</strong>
 - 'text' must use HTML <p> tags, e.g., <p>Doorstep delivery to most of the US.</p>
 - Keep titles short (2-4 words) and texts concise (1 sentence)
 - Focus on trust-building themes: shipping, quality, customer satisfaction, returns
-- Match the product's context and brand tone
-
-IMPORTANT: Return ONLY the JSON, no markdown, no code blocks, no explanations.
-"""
-
-def generate_scroll_footer_text_prompt(brand_name: str, product_title: str, product_description: str, language: str) -> str:
-    return f"""Create 3 scrolling footer texts in {language} for {brand_name}™'s {product_title}.
 
-PRODUCT: {product_description}
-
-Return ONLY valid JSON:
-
-{{
-  "text_1": "<strong>Scrolling text</strong>",
-  "outline_1": "Outline word",
-  "text_2": "<strong>Scrolling text</strong>",
-  "outline_2": "Outline word",
-  "text_3": "<strong>Scrolling text</strong>",
-  "outline_3": "Outline word"
-}}
-
-Requirements:
+Requirements for scroll_texts:
 - 'text_1', 'text_2', 'text_3' must use HTML <strong> tags, e.g., <strong>Free Shipping</strong>
 - 'outline_1', 'outline_2', 'outline_3' must be raw text, single word or short phrase
 - Keep texts short (2-4 words) and impactful, focusing on benefits like shipping, support, or quality
 - Outline words should be a key word from the corresponding text
-- Match the product's context and brand tone
 
-IMPORTANT: Return ONLY the JSON, no markdown, no code blocks, no explanations.
-"""
+Requirements for newsletter:
+- 'heading' must be raw text, no HTML tags, short (5-8 words), encouraging subscription
+- 'text' must use HTML <p> tags, 1-2 sentences, highlighting benefits of subscribing
 
-def generate_newsletter_prompt(brand_name: str, product_title: str, product_description: str, language: str) -> str:
-    return f"""Create newsletter section content in {language} for {brand_name}™'s {product_title}.
-
-PRODUCT: {product_description}
-
-Return ONLY valid JSON:
-
-{{
-  "heading": "Newsletter heading",
-  "text": "<p>Newsletter description</p>"
-}}
+Requirements for footer_contact:
+- 'heading' must be raw text, no HTML tags, short (3-6 words), inviting contact
+- 'subtext' must use HTML <p> tags, including at least email and phone with <strong> tags, e.g., <p><strong>hello@brand.com</strong></p><p>Call: <strong>+1 (123) 456-7890</strong></p>
+- Subtext should include a generic email, phone, and optional support hours
 
-Requirements:
-- 'heading' must be raw text, no HTML tags
-- 'text' must use HTML <p> tags, e.g., <p>Be the first to know about new collections.</p>
-- Heading should be short (5-8 words), encouraging subscription
-- Text should be 1-2 sentences, highlighting benefits of subscribing
-- Match the product's context and brand tone
+All content must match the product's context and brand tone.
 
 IMPORTANT: Return ONLY the JSON, no markdown, no code blocks, no explanations.
 """
 
-def generate_footer_contact_prompt(brand_name: str, product_title: str, product_description: str, language: str) -> str:
-    return f"""Create footer contact content in {language} for {brand_name}™'s {product_title}.
-
-PRODUCT: {product_description}
-
-Return ONLY valid JSON:
-
-{{
-  "heading": "Contact heading",
-  "subtext": "<p>Contact details</p>"
-}}
+def generate_footer_content_user_prompt(brand_name: str, product_title: str, product_description: str, language: str) -> str:
+    return f"""Create the footer content in {language} for {brand_name}™'s {product_title}.
 
-Requirements:
-- 'heading' must be raw text, no HTML tags
-- 'subtext' must use HTML <p> tags, including at least email and phone with <strong> tags, e.g., <p><strong>hello@brand.com</strong></p><p>Call: <strong>+1 (123) 456-7890</strong></p>
-- Heading should be short (3-6 words), inviting contact
-- Subtext should include a generic email, phone, and optional support hours
-- Match the product's context and brand tone
-
-IMPORTANT: Return ONLY the JSON, no markdown, no code blocks, no explanations.
-"""
+PRODUCT: {product_description}"""
 
 # ===== MAIN FOOTER PROCESSING FUNCTION =====
 
-def process_footer_generated_content(brand_name: str, product_title: str, product_description: str, language: str):
+async def process_footer_generated_content(brand_name: str, product_title: str, product_description: str, language: str):
     """Process generated footer content"""
-    # Trust Badges
-    prompt = generate_trust_badges_prompt(brand_name, product_title, product_description, language)
-    result = prompt_gpt(prompt)
+    # All four sections share the same context, so one fused call pays the
+    # network round-trip and prompt prefill once instead of four times
+    prompt = generate_footer_content_user_prompt(brand_name, product_title, product_description, language)
+    # Structured outputs normally guarantee parseable JSON, but a streamed
+    # response that hits max_tokens can still be cut off mid-payload.
+    # 700 tokens comfortably covers the combined payload (badges ~280, scroll
+    # ~120, newsletter ~80, contact ~120) without over-allocating server slots
+    result = await prompt_gpt(prompt, max_tokens=700, response_format=FOOTER_CONTENT_RESPONSE_FORMAT, stream=True, system=FOOTER_CONTENT_SYSTEM_PROMPT)
     try:
-        trust_badges = json.loads(clean_json_response(result))
-    except:
-        fixed_result = fix_json_with_gpt(result, "trust_badges")
-        trust_badges = json.loads(fixed_result)
-    
-    replace_in_file(FOOTER_JSON_PATH, "NEW_TRUST_BADGE_1_TITLE_GENERATED", trust_badges["badge_1"]["title"])
-    replace_in_file(FOOTER_JSON_PATH, "NEW_TRUST_BADGE_1_TEXT_GENERATED", trust_badges["badge_1"]["text"])
-    replace_in_file(FOOTER_JSON_PATH, "NEW_TRUST_BADGE_2_TITLE_GENERATED", trust_badges["badge_2"]["title"])
-    replace_in_file(FOOTER_JSON_PATH, "NEW_TRUST_BADGE_2_TEXT_GENERATED", trust_badges["badge_2"]["text"])
-    replace_in_file(FOOTER_JSON_PATH, "NEW_TRUST_BADGE_3_TITLE_GENERATED", trust_badges["badge_3"]["title"])
-    replace_in_file(FOOTER_JSON_PATH, "NEW_TRUST_BADGE_3_TEXT_GENERATED", trust_badges["badge_3"]["text"])
-    replace_in_file(FOOTER_JSON_PATH, "NEW_TRUST_BADGE_4_TITLE_GENERATED", trust_badges["badge_4"]["title"])
-    replace_in_file(FOOTER_JSON_PATH, "NEW_TRUST_BADGE_4_TEXT_GENERATED", trust_badges["badge_4"]["text"])
-
-    # Scroll Footer Text
-    prompt = generate_scroll_footer_text_prompt(brand_name, product_title, product_description, language)
-    result = prompt_gpt(prompt)
+        footer_content = loads_json(result)
+    except json.JSONDecodeError:
+        # Keep the raw model output in the logs so the failure can be debugged
+        # without re-running the whole generation, then try the repair pass
+        print(f"Failed to parse footer content JSON, attempting fix, raw output: {result}")
+        fixed = await fix_json_with_gpt(result, "footer content")
+        footer_content = loads_json(fixed)
+
+    return footer_content_replacements(footer_content)
+
+def footer_content_replacements(footer_content: Dict[str, Any]) -> Dict[str, str]:
+    """Map the combined generation payload onto its placeholders"""
+    trust_badges = footer_content["trust_badges"]
+    scroll_texts = footer_content["scroll_texts"]
+    newsletter = footer_content["newsletter"]
+    footer_contact = footer_content["footer_contact"]
+
+    return {
+        "NEW_TRUST_BADGE_1_TITLE_GENERATED": trust_badges["badge_1"]["title"],
+        "NEW_TRUST_BADGE_1_TEXT_GENERATED": trust_badges["badge_1"]["text"],
+        "NEW_TRUST_BADGE_2_TITLE_GENERATED": trust_badges["badge_2"]["title"],
+        "NEW_TRUST_BADGE_2_TEXT_GENERATED": trust_badges["badge_2"]["text"],
+        "NEW_TRUST_BADGE_3_TITLE_GENERATED": trust_badges["badge_3"]["title"],
+        "NEW_TRUST_BADGE_3_TEXT_GENERATED": trust_badges["badge_3"]["text"],
+        "NEW_TRUST_BADGE_4_TITLE_GENERATED": trust_badges["badge_4"]["title"],
+        "NEW_TRUST_BADGE_4_TEXT_GENERATED": trust_badges["badge_4"]["text"],
+        "NEW_SCROLL_FOOTER_TEXT_1_GENERATED": scroll_texts["text_1"],
+        "NEW_SCROLL_FOOTER_OUTLINE_1_GENERATED": scroll_texts["outline_1"],
+        "NEW_SCROLL_FOOTER_TEXT_2_GENERATED": scroll_texts["text_2"],
+        "NEW_SCROLL_FOOTER_OUTLINE_2_GENERATED": scroll_texts["outline_2"],
+        "NEW_SCROLL_FOOTER_TEXT_3_GENERATED": scroll_texts["text_3"],
+        "NEW_SCROLL_FOOTER_OUTLINE_3_GENERATED": scroll_texts["outline_3"],
+        "NEW_NEWSLETTER_HEADING_GENERATED": newsletter["heading"],
+        "NEW_NEWSLETTER_TEXT_GENERATED": newsletter["text"],
+        "NEW_FOOTER_CONTACT_HEADING_GENERATED": footer_contact["heading"],
+        "NEW_FOOTER_CONTACT_SUBTEXT_GENERATED": footer_contact["subtext"],
+    }
+
+# Finished replacement dicts are cached per argument set, so re-running with
+# identical CLI args (common during development) skips all GPT work
+RESULT_CACHE_DIR = os.path.expanduser("~/.cache/footer")
+
+def _result_cache_path(brand_name: str, product_title: str, product_description: str, language: str) -> str:
+    key = hashlib.blake2b(
+        f"{brand_name}|{product_title}|{product_description}|{language}".encode("utf-8"),
+        digest_size=16,
+    ).hexdigest()
+    return os.path.join(RESULT_CACHE_DIR, f"{key}.json")
+
+def _load_cached_result(cache_path: str):
     try:
-        scroll_texts = json.loads(clean_json_response(result))
-    except:
-        fixed_result = fix_json_with_gpt(result, "scroll_footer_texts")
-        scroll_texts = json.loads(fixed_result)
-    
-    replace_in_file(FOOTER_JSON_PATH, "NEW_SCROLL_FOOTER_TEXT_1_GENERATED", scroll_texts["text_1"])
-    replace_in_file(FOOTER_JSON_PATH, "NEW_SCROLL_FOOTER_OUTLINE_1_GENERATED", scroll_texts["outline_1"])
-    replace_in_file(FOOTER_JSON_PATH, "NEW_SCROLL_FOOTER_TEXT_2_GENERATED", scroll_texts["text_2"])
-    replace_in_file(FOOTER_JSON_PATH, "NEW_SCROLL_FOOTER_OUTLINE_2_GENERATED", scroll_texts["outline_2"])
-    replace_in_file(FOOTER_JSON_PATH, "NEW_SCROLL_FOOTER_TEXT_3_GENERATED", scroll_texts["text_3"])
-    replace_in_file(FOOTER_JSON_PATH, "NEW_SCROLL_FOOTER_OUTLINE_3_GENERATED", scroll_texts["outline_3"])
-
-    # Newsletter
-    prompt = generate_newsletter_prompt(brand_name, product_title, product_description, language)
-    result = prompt_gpt(prompt)
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def _save_cached_result(cache_path: str, replacements: Dict[str, str]):
     try:
-        newsletter = json.loads(clean_json_response(result))
-    except:
-        fixed_result = fix_json_with_gpt(result, "newsletter")
-        newsletter = json.loads(fixed_result)
-    
-    replace_in_file(FOOTER_JSON_PATH, "NEW_NEWSLETTER_HEADING_GENERATED", newsletter["heading"])
-    replace_in_file(FOOTER_JSON_PATH, "NEW_NEWSLETTER_TEXT_GENERATED", newsletter["text"])
-
-    # Footer Contact
-    prompt = generate_footer_contact_prompt(brand_name, product_title, product_description, language)
-    result = prompt_gpt(prompt)
+        os.makedirs(RESULT_CACHE_DIR, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(replacements, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"Could not save result cache: {e}")
+
+async def _warm_up_connection():
+    """Force DNS + TLS setup into the pool before the first real call"""
     try:
-        footer_contact = json.loads(clean_json_response(result))
-    except:
-        fixed_result = fix_json_with_gpt(result, "footer_contact")
-        footer_contact = json.loads(fixed_result)
-    
-    replace_in_file(FOOTER_JSON_PATH, "NEW_FOOTER_CONTACT_HEADING_GENERATED", footer_contact["heading"])
-    replace_in_file(FOOTER_JSON_PATH, "NEW_FOOTER_CONTACT_SUBTEXT_GENERATED", footer_contact["subtext"])
-
-def change_footer_content(brand_name: str, product_title: str, product_description: str, language: str):
+        await client.models.list()
+    except Exception:
+        pass
+
+async def change_footer_content(brand_name: str, product_title: str, product_description: str, language: str, use_cache: bool = True):
     """Main function to process footer content"""
     print(f"Processing footer content for {brand_name}™ - {product_title} in {language}")
 
+    # Overlap the cold-start handshake with prompt construction and cache checks
+    warmup = asyncio.create_task(_warm_up_connection())
+
+    cache_path = _result_cache_path(brand_name, product_title, product_description, language)
+    if use_cache:
+        cached = _load_cached_result(cache_path)
+        if cached is not None:
+            print("Using cached footer content...")
+            warmup.cancel()
+            apply_replacements(FOOTER_JSON_PATH, cached)
+            print("Footer content processing completed!")
+            return
+
+    replacements = {}
+
     # Process footer translations
     print("Processing footer translations...")
-    process_footer_translations(brand_name, product_title, language)
+    replacements.update(await process_footer_translations(brand_name, product_title, language))
 
     # Process footer generated content
     print("Processing footer generated content...")
-    process_footer_generated_content(brand_name, product_title, product_description, language)
+    replacements.update(await process_footer_generated_content(brand_name, product_title, product_description, language))
+
+    _save_cached_result(cache_path, replacements)
+
+    # Apply everything in a single read/scan/write of the footer JSON
+    apply_replacements(FOOTER_JSON_PATH, replacements)
+
+    print("Footer content processing completed!")
+
+# ===== BATCH API MODE =====
+
+def _batch_request(custom_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+    return {"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body}
+
+async def change_footer_content_batch(brand_name: str, product_title: str, product_description: str, language: str):
+    """Process footer content through the OpenAI Batch API.
 
+    Half the token cost of interactive calls, but completion can take up
+    to 24h — only use when nobody is waiting on the result.
+    """
+    print(f"Processing footer content for {brand_name}™ - {product_title} in {language} (batch mode)")
+
+    replacements = {}
+    requests = []
+
+    for text, placeholder in _FOOTER_TRANSLATIONS:
+        cache_key = f"{language}:{text}"
+        if cache_key in _translation_cache:
+            replacements[placeholder] = _translation_cache[cache_key]
+            continue
+        requests.append(_batch_request(f"translate:{placeholder}", {
+            "model": TRANSLATION_MODEL,
+            "messages": [{"role": "user", "content": f"Translate to {language}. Return only the translation, no explanations: {text}"}],
+            "temperature": 0.3,
+            "max_tokens": 100,
+        }))
+
+    prompt = generate_footer_content_user_prompt(brand_name, product_title, product_description, language)
+    requests.append(_batch_request("footer_content", {
+        "model": "gpt-4o-mini",
+        "messages": _build_messages(prompt, FOOTER_CONTENT_SYSTEM_PROMPT),
+        "temperature": 0.7,
+        "max_tokens": 700,
+        "response_format": FOOTER_CONTENT_RESPONSE_FORMAT,
+    }))
+
+    jsonl = "\n".join(json.dumps(r, ensure_ascii=False) for r in requests).encode("utf-8")
+    batch_file = await client.files.create(file=("footer_batch.jsonl", jsonl), purpose="batch")
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    print(f"Submitted batch {batch.id} with {len(requests)} requests, polling...")
+
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        await asyncio.sleep(30)
+        batch = await client.batches.retrieve(batch.id)
+    if batch.status != "completed":
+        raise Exception(f"Batch {batch.id} finished with status {batch.status}")
+
+    output = await client.files.content(batch.output_file_id)
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        entry = loads_json(line)
+        custom_id = entry["custom_id"]
+        # A completed batch can still carry per-request failures, where
+        # response is null and an error object is set instead
+        if entry.get("error") or not entry.get("response"):
+            print(f"Batch request {custom_id} failed: {entry.get('error')}")
+            continue
+        content = entry["response"]["body"]["choices"][0]["message"]["content"].strip()
+        if custom_id == "footer_content":
+            replacements.update(footer_content_replacements(loads_json(content)))
+        elif custom_id.startswith("translate:"):
+            placeholder = custom_id.split(":", 1)[1]
+            translated = content.replace('"', '')
+            replacements[placeholder] = translated
+            for text, ph in _FOOTER_TRANSLATIONS:
+                if ph == placeholder:
+                    _translation_cache[f"{language}:{text}"] = translated
+
+    apply_replacements(FOOTER_JSON_PATH, replacements)
     print("Footer content processing completed!")
+
+async def _run_and_close(coro):
+    """Await an entry point, then close the shared client inside the same loop.
+
+    Closing from atexit would need a fresh event loop after asyncio.run has
+    already torn down the one the client's HTTP/2 connections belong to,
+    which raises "Event loop is closed" during interpreter shutdown.
+    """
+    try:
+        return await coro
+    finally:
+        await http_client.aclose()
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("brand_name")
     parser.add_argument("product_title")
     parser.add_argument("product_description")
     parser.add_argument("language")
+    parser.add_argument("--batch", action="store_true", help="Use the OpenAI Batch API (cheaper, up to 24h turnaround)")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore cached results for these arguments")
 
     args = parser.parse_args()
 
-    change_footer_content(
-        args.brand_name,
-        args.product_title,
-        args.product_description,
-        args.language
-    )
\ No newline at end of file
+    if args.batch:
+        asyncio.run(_run_and_close(change_footer_content_batch(
+            args.brand_name,
+            args.product_title,
+            args.product_description,
+            args.language
+        )))
+    else:
+        asyncio.run(_run_and_close(change_footer_content(
+            args.brand_name,
+            args.product_title,
+            args.product_description,
+            args.language,
+            use_cache=not args.no_cache
+        )))
\ No newline at end of file
@@ -1,23 +1,76 @@
-from openai import OpenAI
+from openai import AsyncOpenAI
+from aiolimiter import AsyncLimiter
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+import asyncio
+import functools
+import hashlib
+import httpx
 import json
+import orjson
 import re
 from typing import Dict, Any
 import argparse
+import openai
 import os
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# One keepalive pool shared by every call; HTTP/2 multiplexes the concurrent
+# requests over a single TLS connection instead of handshaking per request
+http_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+    timeout=60.0,
+)
+# max_retries=0: chat calls are retried by the tenacity wrapper below, and
+# SDK-internal retries stacked under it would multiply attempts on a
+# persistent failure. Batch-mode file/poll calls are cheap to rerun.
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=http_client, max_retries=0)
 HOME_JSON_PATH = os.getenv("HOME_JSON_PATH")
 
+# Cap concurrent OpenAI requests so a gather() burst stays under RPM limits
+_sem = asyncio.Semaphore(20)
+
+# Token bucket keeping the whole run under the account RPM budget; the
+# semaphore bounds in-flight requests, this bounds the request *rate*
+_limiter = AsyncLimiter(500, 60)
+
+@retry(
+    retry=retry_if_exception_type((openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError)),
+    wait=wait_exponential_jitter(initial=1, max=30),
+    stop=stop_after_attempt(5),
+    reraise=True,
+)
+async def _chat_completion(**kwargs):
+    # Single choke point for every API call: semaphore + backoff with jitter
+    # on retriable errors only; 400/401-style failures propagate immediately
+    async with _limiter:
+        async with _sem:
+            return await client.chat.completions.create(**kwargs)
+
+def loads_json(data: str):
+    """Decode a model response with orjson, falling back to stdlib json
+    which is more forgiving about stray escapes"""
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return json.loads(data)
+
+# Markdown fences stripped from model output; compiled once instead of per response
+_JSON_FENCE_OPEN = re.compile(r'```json\s*')
+_HTML_FENCE_OPEN = re.compile(r'```html\s*')
+_FENCE_CLOSE = re.compile(r'```\s*$')
+
+# Curly quotes (U+201C/U+201D/U+2018/U+2019) -> ASCII, one C-level pass
+_QUOTE_TABLE = str.maketrans({0x201C: '"', 0x201D: '"', 0x2018: "'", 0x2019: "'"})
+
 
 def clean_json_response(response_text: str) -> str:
-    response_text = re.sub(r'```json\s*', '', response_text)
-    response_text = re.sub(r'```\s*$', '', response_text)
+    response_text = _JSON_FENCE_OPEN.sub('', response_text)
+    response_text = _FENCE_CLOSE.sub('', response_text)
     # Fix curly quotes
-    response_text = response_text.replace('"', '"').replace('"', '"')
-    response_text = response_text.replace(''', "'").replace(''', "'")
+    response_text = response_text.translate(_QUOTE_TABLE)
     return response_text.strip()
 
-def fix_json_with_gpt(broken_json: str, context: str) -> str:
+async def fix_json_with_gpt(broken_json: str, context: str) -> str:
     fix_prompt = f"""Fix this broken JSON and return ONLY valid JSON (no explanations, no markdown):
 
 Context: {context}
@@ -31,7 +84,7 @@ Rules:
 - Return only the fixed JSON"""
 
     try:
-        response = client.chat.completions.create(
+        response = await _chat_completion(
             model="gpt-4o-mini",
             messages=[{"role": "user", "content": fix_prompt}],
             temperature=0.1,
@@ -41,161 +94,219 @@ Rules:
     except:
         return broken_json
 
-def prompt_gpt(prompt: str, max_retries: int = 3) -> str:
-    for attempt in range(max_retries):
-        try:
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                max_tokens=300
-            )
-            result = response.choices[0].message.content.strip()
-            return result
-        except Exception as e:
-            if attempt == max_retries - 1:
-                raise e
-            continue
+async def prompt_gpt(prompt: str, temperature: float = 0.7) -> str:
+    response = await _chat_completion(
+        model="gpt-4o-mini",
+        messages=[{"role": "user", "content": prompt}],
+        temperature=temperature,
+        max_tokens=300
+    )
+    return response.choices[0].message.content.strip()
 
-def translate_text(text, target_language):
+_ENGLISH_ALIASES = {"english", "en", "en-us", "en-gb"}
+
+def _is_english(language: str) -> bool:
+    return language.strip().lower() in _ENGLISH_ALIASES
+
+async def translate_text(text, target_language):
+    if _is_english(target_language):
+        return text
     prompt = f"Translate to {target_language}. Return only the translation, no explanations: {text}"
     try:
-        response = client.chat.completions.create(
+        response = await _chat_completion(
             model="gpt-4o-mini",
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
         )
         return response.choices[0].message.content.strip().replace('"','')
     except Exception as e:
+        # None keeps failures distinguishable from real translations so the
+        # caller can fall back to the source text without caching it
         print(f"Translation error: {e}")
-        return text
-
-def replace_in_file(file_path: str, placeholder: str, content: str):
-    with open(file_path, 'r', encoding='utf-8') as f:
+        return None
+
+# Every placeholder in the template follows this shape, so one pattern compiled
+# at import time covers any replacement set — no per-call alternation rebuild.
+# Placeholders are pure ASCII, so the scan runs over raw bytes and skips a
+# full-template UTF-8 decode/encode; only the replacement values get encoded.
+_PLACEHOLDER_PATTERN = re.compile(rb"NEW_[A-Z0-9_]+_(?:TRANSLATED|GENERATED)")
+
+def apply_replacements(file_path: str, replacements: Dict[str, str]):
+    """Apply all placeholder replacements in one linear scan, one read and one write"""
+    if not replacements:
+        return
+    table = {placeholder.encode(): content.encode('utf-8') for placeholder, content in replacements.items()}
+    with open(file_path, 'rb') as f:
         data = f.read()
-    data = data.replace(placeholder, content)
-    with open(file_path, 'w', encoding='utf-8') as f:
+    # Unknown placeholders are left in place, like string.Template.safe_substitute
+    data = _PLACEHOLDER_PATTERN.sub(lambda m: table.get(m.group(0), m.group(0)), data)
+    with open(file_path, 'wb') as f:
         f.write(data)
 
 
+@functools.lru_cache(maxsize=64)
+def _expected_tag_count(expected_format: str) -> int:
+    # The same expected_format is re-checked on every validation retry
+    return len(re.findall(r'<[^>]+>', expected_format))
+
 def validate_html_format(text: str, expected_format: str = None) -> bool:
     """Validate if generated text maintains HTML format"""
     if expected_format and "<" in expected_format:
         # Check if result has similar HTML structure
-        original_tags = re.findall(r'<[^>]+>', expected_format)
         result_tags = re.findall(r'<[^>]+>', text)
-        return len(original_tags) <= len(result_tags)
+        return _expected_tag_count(expected_format) <= len(result_tags)
     return True
 
-def generate_with_format_validation(prompt: str, expected_format: str = None) -> str:
+async def generate_with_format_validation(prompt: str, expected_format: str = None) -> str:
     """Generate content and validate HTML format"""
-    if expected_format and "<" in expected_format:
-        prompt += f"\n\nIMPORTANT: Maintain the exact HTML structure from this example: {expected_format}"
+    if not expected_format or "<" not in expected_format:
+        # Nothing to validate against; one plain call
+        return await prompt_gpt(prompt)
 
-    for attempt in range(3):
-        result = prompt_gpt(prompt)
+    prompt += f"\n\nIMPORTANT: Maintain the exact HTML structure from this example: {expected_format}"
+    result = await prompt_gpt(prompt)
+    for attempt in range(2):
         if validate_html_format(result, expected_format):
             return result
-        prompt += "\n\nPlease maintain the HTML tags structure exactly as shown in the example."
+        # Fixed-size correction prompt instead of growing the original one,
+        # and a low temperature so the reformat stays deterministic
+        correction = (f"Previous output:\n{result}\n\n"
+                      f"Reformat it to match the exact HTML structure of this example: {expected_format}\n"
+                      "Return ONLY the reformatted text, no explanations.")
+        result = await prompt_gpt(correction, temperature=0.2)
 
     return result  # Return last attempt if validation keeps failing
 
 # ===== TRANSLATION FUNCTIONS =====
 
-def process_translations(brand_name: str, product_title: str, language: str):
-    """Process all translation placeholders"""
-
+# (english_text, placeholders) pairs; some strings fill more than one placeholder
+_TRANSLATION_ITEMS = [
     # Hero Section
-    translated = translate_text("Exclusive Holiday Bundles", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_HERO_CAPTION_TRANSLATED", translated)
-
-    translated = translate_text("Save Up To 55%", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_HERO_BUTTON_TRANSLATED", translated)
-
+    ("Exclusive Holiday Bundles", ["NEW_HERO_CAPTION_TRANSLATED"]),
+    ("Save Up To 55%", ["NEW_HERO_BUTTON_TRANSLATED"]),
     # Featured Section
-    translated = translate_text("FEATURED IN", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_FEATURED_IN_TRANSLATED", translated)
-
+    ("FEATURED IN", ["NEW_FEATURED_IN_TRANSLATED"]),
     # Customer Reviews Section
-    translated = translate_text("Look At How Others Are Loving Their Product!", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_CUSTOMER_LOVE_HEADING_TRANSLATED", translated)
-
-    translated = translate_text("Real Reviews From Real People", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_REAL_REVIEWS_SUBHEADING_TRANSLATED", translated)
-
-    translated = translate_text("CLAIM OFFER", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_CLAIM_OFFER_BUTTON_TRANSLATED", translated)
-
+    ("Look At How Others Are Loving Their Product!", ["NEW_CUSTOMER_LOVE_HEADING_TRANSLATED"]),
+    ("Real Reviews From Real People", ["NEW_REAL_REVIEWS_SUBHEADING_TRANSLATED"]),
+    ("CLAIM OFFER", ["NEW_CLAIM_OFFER_BUTTON_TRANSLATED"]),
     # Lookbook Section
-    translated = translate_text("Lookbook", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_LOOKBOOK_HEADING_TRANSLATED", translated)
-
-    translated = translate_text("<p>Optional description for this section</p>", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_LOOKBOOK_DESCRIPTION_TRANSLATED", translated)
-
-    translated = translate_text("Heading", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_LOOKBOOK_POINT_1_TITLE_TRANSLATED", translated)
-    replace_in_file(HOME_JSON_PATH, "NEW_LOOKBOOK_POINT_2_TITLE_TRANSLATED", translated)
-
-    translated = translate_text("Some optional description for this point", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_LOOKBOOK_POINT_1_DESC_TRANSLATED", translated)
-    replace_in_file(HOME_JSON_PATH, "NEW_LOOKBOOK_POINT_2_DESC_TRANSLATED", translated)
-
-    translated = translate_text("View product", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_VIEW_PRODUCT_BUTTON_TRANSLATED", translated)
-
+    ("Lookbook", ["NEW_LOOKBOOK_HEADING_TRANSLATED"]),
+    ("<p>Optional description for this section</p>", ["NEW_LOOKBOOK_DESCRIPTION_TRANSLATED"]),
+    ("Heading", ["NEW_LOOKBOOK_POINT_1_TITLE_TRANSLATED", "NEW_LOOKBOOK_POINT_2_TITLE_TRANSLATED"]),
+    ("Some optional description for this point", ["NEW_LOOKBOOK_POINT_1_DESC_TRANSLATED", "NEW_LOOKBOOK_POINT_2_DESC_TRANSLATED"]),
+    ("View product", ["NEW_VIEW_PRODUCT_BUTTON_TRANSLATED"]),
     # Grid Section
-    translated = translate_text("button", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_BUTTON_TEXT_TRANSLATED", translated)
-
+    ("button", ["NEW_BUTTON_TEXT_TRANSLATED"]),
     # Product Section
-    translated = translate_text("Size Chart", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_SIZE_CHART_TRANSLATED", translated)
-
-    translated = translate_text("1 Pack", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_PACK_1_LABEL_TRANSLATED", translated)
-
-    translated = translate_text("3 Pack", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_PACK_3_LABEL_TRANSLATED", translated)
-
-    translated = translate_text("4 Pack", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_PACK_4_LABEL_TRANSLATED", translated)
-
-    translated = translate_text("5 Pack", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_PACK_5_LABEL_TRANSLATED", translated)
-
-    translated = translate_text("Offer", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_OFFER_LABEL_TRANSLATED", translated)
-
-    translated = translate_text("Most Popular", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_MOST_POPULAR_TRANSLATED", translated)
-
-    translated = translate_text("Save (%)", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_SAVE_TEXT_TRANSLATED", translated)
-
-    translated = translate_text("<p>Buy More Save More</p>", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_BUY_MORE_SAVE_MORE_TRANSLATED", translated)
-
-    translated = translate_text("<p>Limited Time Offer</p>", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_LIMITED_TIME_OFFER_TRANSLATED", translated)
-
+    ("Size Chart", ["NEW_SIZE_CHART_TRANSLATED"]),
+    ("1 Pack", ["NEW_PACK_1_LABEL_TRANSLATED"]),
+    ("3 Pack", ["NEW_PACK_3_LABEL_TRANSLATED"]),
+    ("4 Pack", ["NEW_PACK_4_LABEL_TRANSLATED"]),
+    ("5 Pack", ["NEW_PACK_5_LABEL_TRANSLATED"]),
+    ("Offer", ["NEW_OFFER_LABEL_TRANSLATED"]),
+    ("Most Popular", ["NEW_MOST_POPULAR_TRANSLATED"]),
+    ("Save (%)", ["NEW_SAVE_TEXT_TRANSLATED"]),
+    ("<p>Buy More Save More</p>", ["NEW_BUY_MORE_SAVE_MORE_TRANSLATED"]),
+    ("<p>Limited Time Offer</p>", ["NEW_LIMITED_TIME_OFFER_TRANSLATED"]),
     # Philosophy Section
-    translated = translate_text("OUR PRODUCT PHILOSOPHY", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_PRODUCT_PHILOSOPHY_CAPTION_TRANSLATED", translated)
+    ("OUR PRODUCT PHILOSOPHY", ["NEW_PRODUCT_PHILOSOPHY_CAPTION_TRANSLATED"]),
+    ("Learn More", ["NEW_LEARN_MORE_BUTTON_TRANSLATED"]),
+    # Testimonials
+    ("What our customers say", ["NEW_CUSTOMER_TESTIMONIALS_HEADING_TRANSLATED"]),
+    # Final CTA
+    ("Our Story", ["NEW_OUR_STORY_BUTTON_TRANSLATED"]),
+]
 
-    translated = translate_text("Learn More", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_LEARN_MORE_BUTTON_TRANSLATED", translated)
+# Translations of the fixed strings never change for a given language, so
+# they are cached on disk and re-translated only on the first run per language
+_TRANSLATION_CACHE_DIR = os.path.expanduser("~/.cache/shopify_tmpl")
 
-    # Testimonials
-    translated = translate_text("What our customers say", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_CUSTOMER_TESTIMONIALS_HEADING_TRANSLATED", translated)
+def _translation_cache_path(language: str) -> str:
+    return os.path.join(_TRANSLATION_CACHE_DIR, f"translations_{language.lower().replace(' ', '_')}.json")
 
-    # Final CTA
-    translated = translate_text("Our Story", language)
-    replace_in_file(HOME_JSON_PATH, "NEW_OUR_STORY_BUTTON_TRANSLATED", translated)
+def _translation_key(text: str, language: str) -> str:
+    return hashlib.sha256(f"{text}|{language}".encode()).hexdigest()
+
+def _load_translation_cache(language: str) -> Dict[str, str]:
+    try:
+        with open(_translation_cache_path(language), 'rb') as f:
+            return orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+
+def _save_translation_cache(language: str, cache: Dict[str, str]):
+    os.makedirs(_TRANSLATION_CACHE_DIR, exist_ok=True)
+    path = _translation_cache_path(language)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(cache))
+    os.replace(tmp_path, path)
+
+async def translate_batch(language: str, items=None):
+    """Translate the given (text, placeholders) items in a single request; returns {key: translation} or None"""
+    if items is None:
+        items = _TRANSLATION_ITEMS
+    payload = {placeholders[0]: text for text, placeholders in items}
+    prompt = f"""Translate each value of this JSON object to {language}.
+Return ONLY a JSON object with exactly the same keys and the translated values (no markdown, no explanations):
+
+{json.dumps(payload)}"""
+    try:
+        response = await _chat_completion(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.3,
+            max_tokens=1000
+        )
+        result = response.choices[0].message.content.strip()
+    except Exception as e:
+        print(f"Batch translation error: {e}")
+        return None
+    translations = await safe_json_parse(result, "batch_translations", None)
+    if not isinstance(translations, dict) or set(translations) != set(payload):
+        return None
+    return translations
+
+async def process_translations(brand_name: str, product_title: str, language: str) -> Dict[str, str]:
+    """Build the {placeholder: translation} dict for all translation placeholders"""
+    if _is_english(language):
+        # The source strings are already English; no API calls needed
+        return {placeholder: text for text, placeholders in _TRANSLATION_ITEMS for placeholder in placeholders}
+    cache = _load_translation_cache(language)
+    replacements = {}
+    pending = []
+    for text, placeholders in _TRANSLATION_ITEMS:
+        cached = cache.get(_translation_key(text, language))
+        if cached is not None:
+            for placeholder in placeholders:
+                replacements[placeholder] = cached
+        else:
+            pending.append((text, placeholders))
+    if not pending:
+        return replacements
+
+    translations = await translate_batch(language, pending)
+    if translations is not None:
+        translated_values = [translations[placeholders[0]] for _, placeholders in pending]
+    else:
+        # Batch call failed: fall back to one request per string
+        translated_values = await asyncio.gather(
+            *(translate_text(text, language) for text, _ in pending)
+        )
+    for (text, placeholders), translated in zip(pending, translated_values):
+        if translated is not None:
+            # Cache only real API results; persisting the English fallback
+            # would serve it for this language on every later run
+            cache[_translation_key(text, language)] = translated
+        for placeholder in placeholders:
+            replacements[placeholder] = translated if translated is not None else text
+    _save_translation_cache(language, cache)
+    return replacements
 
 # ===== CONTENT GENERATION FUNCTIONS =====
 
+@functools.lru_cache(maxsize=64)
 def generate_hero_heading_prompt(brand_name: str, product_title: str,product_description:str, language: str) -> str:
     """Generate hero heading prompt"""
     return f"""
@@ -213,6 +324,7 @@ Example format: "Rediscover Your Confidence\\nThis Holiday"
 IMPORTANT: Return ONLY the heading text, no markdown, no code blocks, no explanations.
 """
 
+@functools.lru_cache(maxsize=64)
 def generate_hero_subheading_prompt(brand_name: str, product_title: str,product_description:str, language: str) -> str:
     """Generate hero subheading prompt"""
     return f"""
@@ -227,6 +339,7 @@ Requirements:
 IMPORTANT: Return ONLY the subheading text, no markdown, no code blocks, no explanations.
 """
 
+@functools.lru_cache(maxsize=64)
 def generate_rating_text_prompt(brand_name: str, product_title: str,product_description:str, language: str) -> str:
     """Generate rating text prompt"""
     return f"""
@@ -241,6 +354,7 @@ IMPORTANT: Return ONLY the rating text, no markdown, no code blocks, no explanat
 """
 
 
+@functools.lru_cache(maxsize=64)
 def generate_testimonials_prompt(brand_name: str, product_title: str, product_description: str, language: str) -> str:
     return f"""Create 3 customer testimonials in {language} for {brand_name}™'s {product_title}.
 
@@ -266,6 +380,7 @@ Return ONLY valid JSON with this EXACT format (no markdown, no explanations):
   }}
 }}"""
 
+@functools.lru_cache(maxsize=64)
 def generate_customer_reviews_prompt(brand_name: str, product_title: str, product_description: str, language: str) -> str:
     return f"""Create 3 customer reviews in {language} for {brand_name}™'s {product_title}.
 
@@ -279,6 +394,7 @@ Return ONLY valid JSON (no markdown, no explanations):
   "review_3": "<h1>Transformation headline about <em>{brand_name}™</em><br/></h1><p>Review about impact.</p><h6><strong>Name3 - City3</strong></h6>"
 }}"""
 
+@functools.lru_cache(maxsize=64)
 def generate_benefits_prompt(brand_name: str, product_title: str, product_description: str, language: str) -> str:
     return f"""Create 4 short product benefits in {language} for {brand_name}™'s {product_title}.
 
@@ -303,6 +419,7 @@ Requirements:
 IMPORTANT: Return ONLY the JSON, no markdown, no code blocks, no explanations.
 """
 
+@functools.lru_cache(maxsize=64)
 def generate_scrolling_texts_prompt(brand_name: str, product_title: str, product_description: str, language: str) -> str:
     return f"""Generate 2 inspirational texts in {language} for {brand_name}™'s {product_title}.
 
@@ -316,6 +433,7 @@ Return ONLY valid JSON:
 }}"""
 
 
+@functools.lru_cache(maxsize=64)
 def generate_doctor_testimonial_prompt(brand_name: str, product_title: str, product_description: str, language: str) -> str:
     """Generate expert testimonial with product-matched expertise"""
     return f"""
@@ -350,6 +468,7 @@ Keep the content short and impactful.
 """
 
 
+@functools.lru_cache(maxsize=64)
 def generate_philosophy_heading_prompt(brand_name: str, product_title: str, product_description: str, language: str) -> str:
     """Generate philosophy heading prompt"""
     return f"""
@@ -367,6 +486,7 @@ IMPORTANT: Return ONLY the heading text, no markdown, no code blocks, no explana
 """
 
 
+@functools.lru_cache(maxsize=64)
 def generate_video_section_prompt(brand_name: str, product_title: str, product_description: str, language: str) -> str:
     return f"""Create video section content in {language} for {brand_name}™'s {product_title}.
 
@@ -398,19 +518,20 @@ Example format for HTML fields:
 IMPORTANT: Return ONLY the JSON, no markdown, no code blocks, no explanations.
 """
 
-def safe_json_parse(json_string: str, context: str, fallback_data: dict) -> dict:
+async def safe_json_parse(json_string: str, context: str, fallback_data: dict) -> dict:
     try:
         cleaned = clean_json_response(json_string)
-        return json.loads(cleaned)
-    except json.JSONDecodeError:
+        return loads_json(cleaned)
+    except (orjson.JSONDecodeError, json.JSONDecodeError):
         print(f"JSON parse failed for {context}, trying GPT fix...")
         try:
-            fixed_json = fix_json_with_gpt(json_string, context)
-            return json.loads(fixed_json)
+            fixed_json = await fix_json_with_gpt(json_string, context)
+            return loads_json(fixed_json)
         except:
             print(f"GPT fix failed for {context}, using fallback")
             return fallback_data
 
+@functools.lru_cache(maxsize=64)
 def generate_final_cta_heading_prompt(brand_name: str, product_title: str, product_description: str, language: str) -> str:
     """Generate final CTA heading prompt with emotional variety"""
     return f"""
@@ -442,6 +563,7 @@ IMPORTANT: Return ONLY the heading text with HTML formatting, no markdown, no co
 Create something fresh and inspiring that matches the brand's essence.
 """
 
+@functools.lru_cache(maxsize=64)
 def generate_video_heading_prompt(brand_name: str, product_title: str, product_description: str, language: str) -> str:
     """Generate video heading prompt with dynamic variety"""
     return f"""
@@ -472,155 +594,353 @@ FORMAT REQUIREMENTS:
 IMPORTANT: Return ONLY the heading text with HTML formatting, no markdown, no code blocks, no explanations.
 Make it specific to the product type and brand personality.
 """
+@functools.lru_cache(maxsize=64)
+def generate_short_content_bundle_prompt(brand_name: str, product_title: str, product_description: str, language: str) -> str:
+    """One prompt for every short single-line piece of copy; cuts 6 round-trips to 1"""
+    return f"""Create short marketing copy in {language} for {brand_name}™'s {product_title}.
+
+PRODUCT: {product_description}
+
+Return ONLY valid JSON (no markdown, no explanations):
+
+{{
+  "hero_heading": "Compelling heading, 2 lines max using \\n for the line break, emotional, mentions the holiday theme",
+  "hero_subheading": "Under 15 words, HTML format: Save up to 55% on <strong>Text Here</strong>",
+  "rating_text": "Format: Rated X.X/5 by XXX+ Happy Customers (realistic: 4.7-4.9 rating, 800-2000 customers)",
+  "philosophy_heading": "1-2 inspiring sentences about crafting quality products and exceeding expectations",
+  "video_heading": "Punchy 2-6 word video heading with **strong** tags on key words",
+  "final_cta_heading": "Emotionally compelling call-to-action heading with <strong>/<em> emphasis"
+}}
+
+Each value must be the final copy itself, not a description of it."""
+
 # ===== MAIN PROCESSING FUNCTIONS =====
 
 def clean_html_response(response_text: str) -> str:
     """Clean HTML response by removing markdown code blocks and extra formatting"""
     # Remove HTML markdown code blocks
-    response_text = re.sub(r'```html\s*', '', response_text)
-    response_text = re.sub(r'```\s*$', '', response_text)
+    response_text = _HTML_FENCE_OPEN.sub('', response_text)
+    response_text = _FENCE_CLOSE.sub('', response_text)
     
     # Remove any leading/trailing whitespace
     response_text = response_text.strip()
     
     return response_text
 
-def process_generated_content(brand_name: str, product_title: str, product_description: str, language: str):
-    # Hero Heading
-    prompt = generate_hero_heading_prompt(brand_name, product_title, product_description, language)
-    hero_heading = prompt_gpt(prompt)
-    replace_in_file(HOME_JSON_PATH, "NEW_HERO_HEADING_GENERATED", hero_heading)
-
-    # Hero Subheading
-    prompt = generate_hero_subheading_prompt(brand_name, product_title, product_description, language)
-    hero_subheading = generate_with_format_validation(prompt, "Save up to 55% on <strong>Text Here</strong>")
-    replace_in_file(HOME_JSON_PATH, "NEW_HERO_SUBHEADING_GENERATED", hero_subheading)
-
-    # Rating Text
-    prompt = generate_rating_text_prompt(brand_name, product_title, product_description, language)
-    rating_text = prompt_gpt(prompt)
-    replace_in_file(HOME_JSON_PATH, "NEW_RATING_TEXT_GENERATED", rating_text)
-
-    # Testimonials
-    prompt = generate_testimonials_prompt(brand_name, product_title, product_description, language)
-    result = prompt_gpt(prompt)
-    try:
-        testimonials = json.loads(clean_json_response(result))
-    except:
-        fixed_result = fix_json_with_gpt(result, "testimonials")
-        testimonials = json.loads(fixed_result)
-    
-    replace_in_file(HOME_JSON_PATH, "NEW_TESTIMONIAL_1_CAPTION_GENERATED", testimonials["testimonial_1"]["caption"])
-    replace_in_file(HOME_JSON_PATH, "NEW_TESTIMONIAL_1_TEXT_GENERATED", testimonials["testimonial_1"]["text"])
-    replace_in_file(HOME_JSON_PATH, "NEW_TESTIMONIAL_1_AUTHOR_GENERATED", testimonials["testimonial_1"]["author"])
-    replace_in_file(HOME_JSON_PATH, "NEW_TESTIMONIAL_2_CAPTION_GENERATED", testimonials["testimonial_2"]["caption"])
-    replace_in_file(HOME_JSON_PATH, "NEW_TESTIMONIAL_2_TEXT_GENERATED", testimonials["testimonial_2"]["text"])
-    replace_in_file(HOME_JSON_PATH, "NEW_TESTIMONIAL_2_AUTHOR_GENERATED", testimonials["testimonial_2"]["author"])
-    replace_in_file(HOME_JSON_PATH, "NEW_TESTIMONIAL_3_CAPTION_GENERATED", testimonials["testimonial_3"]["caption"])
-    replace_in_file(HOME_JSON_PATH, "NEW_TESTIMONIAL_3_TEXT_GENERATED", testimonials["testimonial_3"]["text"])
-    replace_in_file(HOME_JSON_PATH, "NEW_TESTIMONIAL_3_AUTHOR_GENERATED", testimonials["testimonial_3"]["author"])
-
-    # Customer Reviews
-    prompt = generate_customer_reviews_prompt(brand_name, product_title, product_description, language)
-    result = prompt_gpt(prompt)
-    try:
-        reviews = json.loads(clean_json_response(result))
-    except:
-        fixed_result = fix_json_with_gpt(result, "reviews")
-        reviews = json.loads(fixed_result)
-    
-    replace_in_file(HOME_JSON_PATH, "NEW_CUSTOMER_REVIEW_1_GENERATED", reviews["review_1"])
-    replace_in_file(HOME_JSON_PATH, "NEW_CUSTOMER_REVIEW_2_GENERATED", reviews["review_2"])
-    replace_in_file(HOME_JSON_PATH, "NEW_CUSTOMER_REVIEW_3_GENERATED", reviews["review_3"])
-
-    # Benefits
-    prompt = generate_benefits_prompt(brand_name, product_title, product_description, language)
-    result = prompt_gpt(prompt)
-    try:
-        benefits = json.loads(clean_json_response(result))
-    except:
-        fixed_result = fix_json_with_gpt(result, "benefits")
-        benefits = json.loads(fixed_result)
-    
-    replace_in_file(HOME_JSON_PATH, "NEW_BENEFIT_1_TEXT_GENERATED", benefits["benefit_1"])
-    replace_in_file(HOME_JSON_PATH, "NEW_BENEFIT_2_TEXT_GENERATED", benefits["benefit_2"])
-    replace_in_file(HOME_JSON_PATH, "NEW_BENEFIT_3_HEADING_GENERATED", benefits["benefit_3"])
-    replace_in_file(HOME_JSON_PATH, "NEW_BENEFIT_4_HEADING_GENERATED", benefits["benefit_4_heading"])
-    replace_in_file(HOME_JSON_PATH, "NEW_BENEFIT_4_TEXT_GENERATED", benefits["benefit_4_text"])
-
-    # Scrolling Texts
-    prompt = generate_scrolling_texts_prompt(brand_name, product_title, product_description, language)
-    result = prompt_gpt(prompt)
-    try:
-        texts = json.loads(clean_json_response(result))
-    except:
-        fixed_result = fix_json_with_gpt(result, "scrolling_texts")
-        texts = json.loads(fixed_result)
-    
-    replace_in_file(HOME_JSON_PATH, "NEW_SCROLLING_TEXT_1_GENERATED", texts["text_1"])
-    replace_in_file(HOME_JSON_PATH, "NEW_SCROLLING_TEXT_2_GENERATED", texts["text_2"])
+async def process_generated_content(brand_name: str, product_title: str, product_description: str, language: str) -> Dict[str, str]:
+    """Run every independent generation prompt concurrently and merge the results"""
 
-    # Video Content
-    prompt = generate_video_section_prompt(brand_name, product_title, product_description, language)
-    result = prompt_gpt(prompt)
-    try:
-        video_content = json.loads(clean_json_response(result))
-    except:
-        fixed_result = fix_json_with_gpt(result, "video_content")
-        video_content = json.loads(fixed_result)
-    
-    replace_in_file(HOME_JSON_PATH, "NEW_BEAUTY_SERENITY_HEADING_GENERATED", video_content["heading"])
-    replace_in_file(HOME_JSON_PATH, "NEW_VIDEO_SECTION_DESCRIPTION_GENERATED", video_content["description"])
-    replace_in_file(HOME_JSON_PATH, "NEW_FEATURE_1_GENERATED", video_content["feature_1"])
-    replace_in_file(HOME_JSON_PATH, "NEW_FEATURE_2_GENERATED", video_content["feature_2"])
-    replace_in_file(HOME_JSON_PATH, "NEW_FEATURE_3_GENERATED", video_content["feature_3"])
-    replace_in_file(HOME_JSON_PATH, "NEW_PERCENTAGE_TEXT_GENERATED", video_content["percentage_text"])
-
-    # Video Heading
-    prompt = generate_video_heading_prompt(brand_name, product_title, product_description, language)
-    video_heading = generate_with_format_validation(prompt, "**Transform** Your Experience")
-    replace_in_file(HOME_JSON_PATH, "NEW_VIDEO_HEADING_GENERATED", video_heading)
-
-    # Philosophy Heading
-    prompt = generate_philosophy_heading_prompt(brand_name, product_title, product_description, language)
-    philosophy_heading = prompt_gpt(prompt)
-    replace_in_file(HOME_JSON_PATH, "NEW_PHILOSOPHY_HEADING_GENERATED", philosophy_heading)
-
-    # Doctor Testimonial
-    prompt = generate_doctor_testimonial_prompt(brand_name, product_title, product_description, language)
-    doctor_testimonial = generate_with_format_validation(prompt, "<p><strong>Compelling quote about product quality/results</strong></p><h6><strong>Expert Name, Specific Title/Credentials</strong></h6>")
-    replace_in_file(HOME_JSON_PATH, "NEW_DOCTOR_TESTIMONIAL_GENERATED", doctor_testimonial)
-
-    # Final CTA Heading
-    prompt = generate_final_cta_heading_prompt(brand_name, product_title, product_description, language)
-    result = generate_with_format_validation(prompt, "Love <strong>Your Skin</strong>, Let Your <em>Radiance</em> Begin")
-    replace_in_file(HOME_JSON_PATH, "NEW_FINAL_CTA_HEADING_GENERATED", result)
-
-def change_home_page_content(brand_name: str, product_title: str, product_description: str, language: str):
+    async def gen_short_bundle():
+        prompt = generate_short_content_bundle_prompt(brand_name, product_title, product_description, language)
+        result = await prompt_gpt(prompt)
+        try:
+            bundle = loads_json(clean_json_response(result))
+        except:
+            fixed_result = await fix_json_with_gpt(result, "short_content_bundle")
+            bundle = loads_json(fixed_result)
+        return {
+            "NEW_HERO_HEADING_GENERATED": bundle["hero_heading"],
+            "NEW_HERO_SUBHEADING_GENERATED": bundle["hero_subheading"],
+            "NEW_RATING_TEXT_GENERATED": bundle["rating_text"],
+            "NEW_PHILOSOPHY_HEADING_GENERATED": bundle["philosophy_heading"],
+            "NEW_VIDEO_HEADING_GENERATED": bundle["video_heading"],
+            "NEW_FINAL_CTA_HEADING_GENERATED": bundle["final_cta_heading"],
+        }
+
+    async def gen_testimonials():
+        prompt = generate_testimonials_prompt(brand_name, product_title, product_description, language)
+        result = await prompt_gpt(prompt)
+        try:
+            testimonials = loads_json(clean_json_response(result))
+        except:
+            fixed_result = await fix_json_with_gpt(result, "testimonials")
+            testimonials = loads_json(fixed_result)
+        return {
+            "NEW_TESTIMONIAL_1_CAPTION_GENERATED": testimonials["testimonial_1"]["caption"],
+            "NEW_TESTIMONIAL_1_TEXT_GENERATED": testimonials["testimonial_1"]["text"],
+            "NEW_TESTIMONIAL_1_AUTHOR_GENERATED": testimonials["testimonial_1"]["author"],
+            "NEW_TESTIMONIAL_2_CAPTION_GENERATED": testimonials["testimonial_2"]["caption"],
+            "NEW_TESTIMONIAL_2_TEXT_GENERATED": testimonials["testimonial_2"]["text"],
+            "NEW_TESTIMONIAL_2_AUTHOR_GENERATED": testimonials["testimonial_2"]["author"],
+            "NEW_TESTIMONIAL_3_CAPTION_GENERATED": testimonials["testimonial_3"]["caption"],
+            "NEW_TESTIMONIAL_3_TEXT_GENERATED": testimonials["testimonial_3"]["text"],
+            "NEW_TESTIMONIAL_3_AUTHOR_GENERATED": testimonials["testimonial_3"]["author"],
+        }
+
+    async def gen_customer_reviews():
+        prompt = generate_customer_reviews_prompt(brand_name, product_title, product_description, language)
+        result = await prompt_gpt(prompt)
+        try:
+            reviews = loads_json(clean_json_response(result))
+        except:
+            fixed_result = await fix_json_with_gpt(result, "reviews")
+            reviews = loads_json(fixed_result)
+        return {
+            "NEW_CUSTOMER_REVIEW_1_GENERATED": reviews["review_1"],
+            "NEW_CUSTOMER_REVIEW_2_GENERATED": reviews["review_2"],
+            "NEW_CUSTOMER_REVIEW_3_GENERATED": reviews["review_3"],
+        }
+
+    async def gen_benefits():
+        prompt = generate_benefits_prompt(brand_name, product_title, product_description, language)
+        result = await prompt_gpt(prompt)
+        try:
+            benefits = loads_json(clean_json_response(result))
+        except:
+            fixed_result = await fix_json_with_gpt(result, "benefits")
+            benefits = loads_json(fixed_result)
+        return {
+            "NEW_BENEFIT_1_TEXT_GENERATED": benefits["benefit_1"],
+            "NEW_BENEFIT_2_TEXT_GENERATED": benefits["benefit_2"],
+            "NEW_BENEFIT_3_HEADING_GENERATED": benefits["benefit_3"],
+            "NEW_BENEFIT_4_HEADING_GENERATED": benefits["benefit_4_heading"],
+            "NEW_BENEFIT_4_TEXT_GENERATED": benefits["benefit_4_text"],
+        }
+
+    async def gen_scrolling_texts():
+        prompt = generate_scrolling_texts_prompt(brand_name, product_title, product_description, language)
+        result = await prompt_gpt(prompt)
+        try:
+            texts = loads_json(clean_json_response(result))
+        except:
+            fixed_result = await fix_json_with_gpt(result, "scrolling_texts")
+            texts = loads_json(fixed_result)
+        return {
+            "NEW_SCROLLING_TEXT_1_GENERATED": texts["text_1"],
+            "NEW_SCROLLING_TEXT_2_GENERATED": texts["text_2"],
+        }
+
+    async def gen_video_content():
+        prompt = generate_video_section_prompt(brand_name, product_title, product_description, language)
+        result = await prompt_gpt(prompt)
+        try:
+            video_content = loads_json(clean_json_response(result))
+        except:
+            fixed_result = await fix_json_with_gpt(result, "video_content")
+            video_content = loads_json(fixed_result)
+        return {
+            "NEW_BEAUTY_SERENITY_HEADING_GENERATED": video_content["heading"],
+            "NEW_VIDEO_SECTION_DESCRIPTION_GENERATED": video_content["description"],
+            "NEW_FEATURE_1_GENERATED": video_content["feature_1"],
+            "NEW_FEATURE_2_GENERATED": video_content["feature_2"],
+            "NEW_FEATURE_3_GENERATED": video_content["feature_3"],
+            "NEW_PERCENTAGE_TEXT_GENERATED": video_content["percentage_text"],
+        }
+
+    async def gen_doctor_testimonial():
+        prompt = generate_doctor_testimonial_prompt(brand_name, product_title, product_description, language)
+        result = await generate_with_format_validation(prompt, "<p><strong>Compelling quote about product quality/results</strong></p><h6><strong>Expert Name, Specific Title/Credentials</strong></h6>")
+        return {"NEW_DOCTOR_TESTIMONIAL_GENERATED": result}
+
+    results = await asyncio.gather(
+        gen_short_bundle(),
+        gen_testimonials(),
+        gen_customer_reviews(),
+        gen_benefits(),
+        gen_scrolling_texts(),
+        gen_video_content(),
+        gen_doctor_testimonial(),
+    )
+
+    replacements = {}
+    for partial in results:
+        replacements.update(partial)
+    return replacements
+
+async def change_home_page_content(brand_name: str, product_title: str, product_description: str, language: str):
     """Main function to process all content"""
     print(f"Processing content for {brand_name}™ - {product_title} in {language}")
 
+    replacements = {}
+
     # Process translations
     print("Processing translations...")
-    process_translations(brand_name, product_title, language)
+    replacements.update(await process_translations(brand_name, product_title, language))
 
     # Process generated content
     print("Processing generated content...")
-    process_generated_content(brand_name, product_title, product_description, language)
+    replacements.update(await process_generated_content(brand_name, product_title, product_description, language))
 
+    apply_replacements(HOME_JSON_PATH, replacements)
+    print("Content processing completed!")
+
+# ===== BATCH API MODE =====
+
+def _batch_request(custom_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+    return {"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body}
+
+# Sections whose response is plain text filling a single placeholder
+_BATCH_TEXT_SECTIONS = {
+    "hero_heading": (generate_hero_heading_prompt, "NEW_HERO_HEADING_GENERATED"),
+    "hero_subheading": (generate_hero_subheading_prompt, "NEW_HERO_SUBHEADING_GENERATED"),
+    "rating_text": (generate_rating_text_prompt, "NEW_RATING_TEXT_GENERATED"),
+    "video_heading": (generate_video_heading_prompt, "NEW_VIDEO_HEADING_GENERATED"),
+    "philosophy_heading": (generate_philosophy_heading_prompt, "NEW_PHILOSOPHY_HEADING_GENERATED"),
+    "doctor_testimonial": (generate_doctor_testimonial_prompt, "NEW_DOCTOR_TESTIMONIAL_GENERATED"),
+    "final_cta_heading": (generate_final_cta_heading_prompt, "NEW_FINAL_CTA_HEADING_GENERATED"),
+}
+
+# Sections whose response is JSON; placeholder -> path into the parsed payload
+_BATCH_JSON_SECTIONS = {
+    "testimonials": (generate_testimonials_prompt, {
+        "NEW_TESTIMONIAL_1_CAPTION_GENERATED": ("testimonial_1", "caption"),
+        "NEW_TESTIMONIAL_1_TEXT_GENERATED": ("testimonial_1", "text"),
+        "NEW_TESTIMONIAL_1_AUTHOR_GENERATED": ("testimonial_1", "author"),
+        "NEW_TESTIMONIAL_2_CAPTION_GENERATED": ("testimonial_2", "caption"),
+        "NEW_TESTIMONIAL_2_TEXT_GENERATED": ("testimonial_2", "text"),
+        "NEW_TESTIMONIAL_2_AUTHOR_GENERATED": ("testimonial_2", "author"),
+        "NEW_TESTIMONIAL_3_CAPTION_GENERATED": ("testimonial_3", "caption"),
+        "NEW_TESTIMONIAL_3_TEXT_GENERATED": ("testimonial_3", "text"),
+        "NEW_TESTIMONIAL_3_AUTHOR_GENERATED": ("testimonial_3", "author"),
+    }),
+    "reviews": (generate_customer_reviews_prompt, {
+        "NEW_CUSTOMER_REVIEW_1_GENERATED": ("review_1",),
+        "NEW_CUSTOMER_REVIEW_2_GENERATED": ("review_2",),
+        "NEW_CUSTOMER_REVIEW_3_GENERATED": ("review_3",),
+    }),
+    "benefits": (generate_benefits_prompt, {
+        "NEW_BENEFIT_1_TEXT_GENERATED": ("benefit_1",),
+        "NEW_BENEFIT_2_TEXT_GENERATED": ("benefit_2",),
+        "NEW_BENEFIT_3_HEADING_GENERATED": ("benefit_3",),
+        "NEW_BENEFIT_4_HEADING_GENERATED": ("benefit_4_heading",),
+        "NEW_BENEFIT_4_TEXT_GENERATED": ("benefit_4_text",),
+    }),
+    "scrolling_texts": (generate_scrolling_texts_prompt, {
+        "NEW_SCROLLING_TEXT_1_GENERATED": ("text_1",),
+        "NEW_SCROLLING_TEXT_2_GENERATED": ("text_2",),
+    }),
+    "video_content": (generate_video_section_prompt, {
+        "NEW_BEAUTY_SERENITY_HEADING_GENERATED": ("heading",),
+        "NEW_VIDEO_SECTION_DESCRIPTION_GENERATED": ("description",),
+        "NEW_FEATURE_1_GENERATED": ("feature_1",),
+        "NEW_FEATURE_2_GENERATED": ("feature_2",),
+        "NEW_FEATURE_3_GENERATED": ("feature_3",),
+        "NEW_PERCENTAGE_TEXT_GENERATED": ("percentage_text",),
+    }),
+}
+
+async def change_home_page_content_batch(brand_name: str, product_title: str, product_description: str, language: str):
+    """Process all content through the OpenAI Batch API.
+
+    Half the token cost of interactive calls, but completion can take up
+    to 24h — only use when nobody is waiting on the result.
+    """
+    print(f"Processing content for {brand_name}™ - {product_title} in {language} (batch mode)")
+
+    cache = _load_translation_cache(language)
+    replacements = {}
+    requests = []
+
+    for text, placeholders in _TRANSLATION_ITEMS:
+        cached = text if _is_english(language) else cache.get(_translation_key(text, language))
+        if cached is not None:
+            for placeholder in placeholders:
+                replacements[placeholder] = cached
+            continue
+        requests.append(_batch_request(f"translate:{placeholders[0]}", {
+            "model": "gpt-4o-mini",
+            "messages": [{"role": "user", "content": f"Translate to {language}. Return only the translation, no explanations: {text}"}],
+            "temperature": 0.3,
+        }))
+
+    for section, (prompt_builder, _) in _BATCH_TEXT_SECTIONS.items():
+        requests.append(_batch_request(section, {
+            "model": "gpt-4o-mini",
+            "messages": [{"role": "user", "content": prompt_builder(brand_name, product_title, product_description, language)}],
+            "temperature": 0.7,
+            "max_tokens": 300,
+        }))
+    for section, (prompt_builder, _) in _BATCH_JSON_SECTIONS.items():
+        requests.append(_batch_request(section, {
+            "model": "gpt-4o-mini",
+            "messages": [{"role": "user", "content": prompt_builder(brand_name, product_title, product_description, language)}],
+            "temperature": 0.7,
+            "max_tokens": 300,
+        }))
+
+    jsonl = "\n".join(json.dumps(r, ensure_ascii=False) for r in requests).encode("utf-8")
+    batch_file = await client.files.create(file=("home_batch.jsonl", jsonl), purpose="batch")
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    print(f"Submitted batch {batch.id} with {len(requests)} requests, polling...")
+
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        await asyncio.sleep(30)
+        batch = await client.batches.retrieve(batch.id)
+    if batch.status != "completed":
+        raise Exception(f"Batch {batch.id} finished with status {batch.status}")
+
+    output = await client.files.content(batch.output_file_id)
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        entry = loads_json(line)
+        custom_id = entry["custom_id"]
+        # Completed batches can still carry per-request failures with a null
+        # response and an error object set
+        if entry.get("error") or not entry.get("response"):
+            print(f"Batch request {custom_id} failed: {entry.get('error')}")
+            continue
+        content = entry["response"]["body"]["choices"][0]["message"]["content"].strip()
+        if custom_id.startswith("translate:"):
+            anchor = custom_id.split(":", 1)[1]
+            translated = content.replace('"', '')
+            for text, placeholders in _TRANSLATION_ITEMS:
+                if placeholders[0] == anchor:
+                    cache[_translation_key(text, language)] = translated
+                    for placeholder in placeholders:
+                        replacements[placeholder] = translated
+        elif custom_id in _BATCH_TEXT_SECTIONS:
+            replacements[_BATCH_TEXT_SECTIONS[custom_id][1]] = clean_html_response(content)
+        elif custom_id in _BATCH_JSON_SECTIONS:
+            _, key_map = _BATCH_JSON_SECTIONS[custom_id]
+            data = await safe_json_parse(content, custom_id, {})
+            for placeholder, path in key_map.items():
+                value = data
+                for key in path:
+                    value = value[key]
+                replacements[placeholder] = value
+
+    _save_translation_cache(language, cache)
+    apply_replacements(HOME_JSON_PATH, replacements)
     print("Content processing completed!")
+
+async def _run_and_close(coro):
+    """Await an entry point, then close the shared client on the same loop.
+
+    An atexit aclose() would have to spin up a new event loop after the one
+    the HTTP/2 connections belong to is gone, which fails with "Event loop
+    is closed" at interpreter shutdown.
+    """
+    try:
+        return await coro
+    finally:
+        await http_client.aclose()
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("brand_name")
     parser.add_argument("product_title")
     parser.add_argument("product_description")
     parser.add_argument("language")
+    parser.add_argument("--batch", action="store_true", help="Use the OpenAI Batch API (cheaper, up to 24h turnaround)")
 
     args = parser.parse_args()
 
-    change_home_page_content(
-        args.brand_name,
-        args.product_title,
-        args.product_description,
-        args.language
-    )
\ No newline at end of file
+    if args.batch:
+        asyncio.run(_run_and_close(change_home_page_content_batch(
+            args.brand_name,
+            args.product_title,
+            args.product_description,
+            args.language
+        )))
+    else:
+        asyncio.run(_run_and_close(change_home_page_content(
+            args.brand_name,
+            args.product_title,
+            args.product_description,
+            args.language
+        )))
\ No newline at end of file